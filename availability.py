@@ -0,0 +1,209 @@
+# availability.py
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+
+from fragment_cache import FragmentCache
+from models import db, AvailabilitySlot
+
+# Lightweight copy of a slot kept in the index (no ORM instance)
+SlotEntry = namedtuple("SlotEntry", "id starts_at ends_at level booked")
+
+
+class SlotIndex:
+    """
+    Sorted interval index over availability slots.
+
+    Slots never overlap (add_slot refuses conflicts), so sorting them by
+    start also sorts them by end. That lets both lookups below binary
+    search for the first and last matching slot: O(log n + k) where k
+    is the number of slots returned.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda entry: entry.starts_at)
+        self.starts = [entry.starts_at for entry in self.entries]
+        self.ends = [entry.ends_at for entry in self.entries]
+        self.by_id = {entry.id: entry for entry in self.entries}
+
+    def overlapping(self, starts_at, ends_at):
+        """
+        Slots overlapping [starts_at, ends_at).
+        """
+        first = bisect_right(self.ends, starts_at)
+        last = bisect_left(self.starts, ends_at)
+        return self.entries[first:last]
+
+    def conflicts(self, starts_at, ends_at):
+        return bool(self.overlapping(starts_at, ends_at))
+
+    def free_slots(self, starts_at, ends_at, level=None):
+        """
+        Unbooked slots that start inside [starts_at, ends_at) and suit
+        the level (slots without a level are open to every level).
+        """
+        first = bisect_left(self.starts, starts_at)
+        last = bisect_left(self.starts, ends_at)
+
+        return [
+            entry for entry in self.entries[first:last]
+            if not entry.booked and (entry.level is None or level is None or entry.level == level)
+        ]
+
+    def is_free_for(self, slot_id, level):
+        entry = self.by_id.get(slot_id)
+        return (
+            entry is not None
+            and not entry.booked
+            and (entry.level is None or entry.level == level)
+        )
+
+
+LEVELS = ("gcse", "alevel")
+
+# How far from today /tutoring/availability can look, in weeks
+MAX_WEEKS_AWAY = 52
+
+_lock = threading.Lock()
+# responses is bounded (LRU) so odd query strings cannot grow it forever
+_cached = {"version": None, "index": None, "responses": FragmentCache(max_entries=128)}
+
+
+def get_slot_index():
+    """
+    Returns the slot index, rebuilding it only when the slots or their
+    bookings have changed since it was built (checked with one small
+    aggregate query). Needs an app context.
+    """
+    version = tuple(AvailabilitySlot.get_version())
+
+    with _lock:
+        if _cached["version"] == version:
+            return _cached["index"]
+
+    entries = [
+        SlotEntry(slot.id, slot.starts_at, slot.ends_at, slot.level, booked)
+        for slot, booked in AvailabilitySlot.get_all_with_booked_flag()
+    ]
+    index = SlotIndex(entries)
+
+    with _lock:
+        _cached["version"] = version
+        _cached["index"] = index
+        _cached["responses"] = FragmentCache(max_entries=128)
+
+    return index
+
+
+def week_bounds(day: date):
+    """
+    Monday 00:00 to the following Monday 00:00 for the week containing day.
+    """
+    monday = day - timedelta(days=day.weekday())
+    starts_at = datetime.combine(monday, time.min)
+    return starts_at, starts_at + timedelta(days=7)
+
+
+def free_slots_for_week(level, day: date):
+    """
+    JSON-ready free slots for a level in the week containing day.
+    The result is cached until a booking or slot change bumps the version.
+
+    Raises ValueError for an unknown level or a week more than
+    MAX_WEEKS_AWAY weeks from today.
+    """
+    if level is not None and level not in LEVELS:
+        raise ValueError(f"level must be one of {', '.join(LEVELS)}")
+    if abs((day - date.today()).days) > MAX_WEEKS_AWAY * 7:
+        raise ValueError(f"week must be within {MAX_WEEKS_AWAY} weeks of today")
+
+    index = get_slot_index()
+    starts_at, ends_at = week_bounds(day)
+    key = (level, starts_at)
+
+    with _lock:
+        # Only reuse a response built from this exact index
+        if _cached["index"] is index:
+            cached = _cached["responses"].get(key)
+            if cached is not None:
+                return cached
+
+    response = {
+        "level": level,
+        "week_start": starts_at.date().isoformat(),
+        "slots": [
+            {
+                "id": entry.id,
+                "starts_at": entry.starts_at.isoformat(),
+                "ends_at": entry.ends_at.isoformat(),
+                "level": entry.level,
+            }
+            for entry in index.free_slots(starts_at, ends_at, level)
+        ],
+    }
+
+    with _lock:
+        if _cached["index"] is index:
+            _cached["responses"].set(key, response)
+
+    return response
+
+
+def add_slot(starts_at, ends_at, level=None):
+    """
+    Adds a slot unless it overlaps an existing one.
+    Raises ValueError on a conflict or an empty interval.
+    """
+    if ends_at <= starts_at:
+        raise ValueError("A slot must end after it starts")
+
+    clash = get_slot_index().overlapping(starts_at, ends_at)
+    if clash:
+        raise ValueError(f"Slot overlaps existing slot {clash[0].id}")
+
+    slot = AvailabilitySlot(starts_at=starts_at, ends_at=ends_at, level=level)
+    db.session.add(slot)
+    db.session.commit()
+    return slot
+
+
+def remove_slot(slot_id):
+    """
+    Removes a slot that has no active booking.
+    Raises ValueError if it does not exist or is booked.
+    """
+    index = get_slot_index()
+    entry = index.by_id.get(slot_id)
+
+    if entry is None:
+        raise ValueError(f"Slot {slot_id} does not exist")
+    if entry.booked:
+        raise ValueError(f"Slot {slot_id} is booked, cancel the booking first")
+
+    db.session.delete(AvailabilitySlot.get_by_id(slot_id))
+    db.session.commit()
+
+
+LEVEL_LABELS = {"gcse": "GCSE", "alevel": "A-Level"}
+
+
+def slot_label(entry):
+    label = f"{entry.starts_at:%a %d %b, %H:%M}–{entry.ends_at:%H:%M}"
+    if entry.level:
+        label += f" ({LEVEL_LABELS.get(entry.level, entry.level)})"
+    return label
+
+
+def upcoming_slot_choices(days: int = 14):
+    """
+    (value, label) choices for the booking form: free slots
+    starting in the next few days, for any level.
+    """
+    now = datetime.now()
+    index = get_slot_index()
+
+    return [
+        (str(entry.id), slot_label(entry))
+        for entry in index.free_slots(now, now + timedelta(days=days))
+    ]
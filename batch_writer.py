@@ -0,0 +1,134 @@
+# batch_writer.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from models import db
+
+
+class GroupCommitWriter:
+    """
+    Group-commit writer for form submissions.
+
+    Each Booking/Review insert used to run in its own transaction,
+    which on SQLite means one fsync per row. This writer collects the
+    inserts submitted by concurrent requests for a few milliseconds and
+    flushes them together in a single transaction.
+
+    Every submission gets its own Future, so the request that submitted
+    the row still finds out whether it was saved (and its new id).
+    """
+
+    def __init__(self, app, window_ms: int = 5, max_batch: int = 100):
+        self.app = app
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="group-commit-writer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, model, values: dict, on_insert=None) -> Future:
+        """
+        Queue one row for insertion.
+
+        Plain column values are passed in (not a model instance) so the
+        row is only ever attached to the writer thread's session.
+        on_insert(record), if given, runs in the same transaction right
+        after the row is flushed, so related updates commit (or fail)
+        together with the row.
+        The returned Future resolves to the primary key of the new row.
+        """
+        future = Future()
+        self._queue.put((model, values, on_insert, future))
+        return future
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def backlog(self) -> int:
+        """
+        Rows waiting to be committed (approximate).
+        """
+        return self._queue.qsize()
+
+    def _collect(self):
+        # Block until the first row arrives, then keep collecting
+        # until the window closes or the batch is full. The window is
+        # measured from the first row, so a steady stream of requests
+        # cannot keep extending it.
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+
+        try:
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                batch.append(self._queue.get(timeout=remaining))
+        except queue.Empty:
+            pass
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+
+            try:
+                with self.app.app_context():
+                    self._flush(batch)
+            except Exception as exc:
+                # Never let the writer thread die: fail whatever
+                # is still unresolved and carry on with the next batch.
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _flush(self, batch):
+        try:
+            records = [model(**values) for model, values, _, _ in batch]
+            db.session.add_all(records)
+
+            # ids are read after flush so they do not trigger
+            # a refresh query per row once the commit expires them.
+            db.session.flush()
+            ids = [record.id for record in records]
+
+            for (_, _, on_insert, _), record in zip(batch, records):
+                if on_insert is not None:
+                    on_insert(record)
+
+            db.session.commit()
+
+        except Exception:
+            db.session.rollback()
+
+            # One bad row should not fail everyone else in the batch,
+            # so fall back to one transaction per row.
+            self._flush_one_by_one(batch)
+            return
+
+        for (*_, future), record_id in zip(batch, ids):
+            future.set_result(record_id)
+
+    def _flush_one_by_one(self, batch):
+        for model, values, on_insert, future in batch:
+            try:
+                record = model(**values)
+                db.session.add(record)
+                db.session.flush()
+                record_id = record.id
+                if on_insert is not None:
+                    on_insert(record)
+                db.session.commit()
+            except Exception as exc:
+                db.session.rollback()
+                future.set_exception(exc)
+            else:
+                future.set_result(record_id)
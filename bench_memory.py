@@ -0,0 +1,138 @@
+"""
+Memory benchmark for the hot read paths.
+
+Seeds a throwaway SQLite database with a large number of blogs and
+bookings, then compares peak Python allocations (tracemalloc) of the
+full-ORM reads against the projection reads used by the routes.
+
+    python bench_memory.py
+    python bench_memory.py --blogs 5000 --bookings 50000
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+
+def seed(db, Blog, Booking, blog_count, booking_count):
+    """
+    Inserts blog_count blogs (about 8 KB of content each)
+    and booking_count bookings.
+    """
+    content = "Lorem ipsum dolor sit amet. " * 300
+    now = datetime.utcnow()
+
+    db.session.execute(
+        db.insert(Blog),
+        [
+            {
+                "slug": f"blog-{i}",
+                "card_position": i,
+                "title": f"Blog post {i}",
+                "meta": "Engineering • Benchmark",
+                "summary": "A seeded blog post used for the memory benchmark.",
+                "content": content,
+                "read_time": "8 min read",
+                "published": True,
+                "created_at": now,
+                "updated_at": now - timedelta(minutes=i),
+            }
+            for i in range(blog_count)
+        ],
+    )
+
+    db.session.execute(
+        db.insert(Booking),
+        [
+            {
+                "name": f"Student {i}",
+                "level": "gcse" if i % 2 else "alevel",
+                "exam_board": "AQA",
+                "email": f"student{i}@example.com",
+                "preferred_times": "Weekday evenings",
+                "message": "Would like help with algorithms and exam technique. " * 5,
+                "status": "pending",
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(booking_count)
+        ],
+    )
+
+    db.session.commit()
+
+
+def peak_allocation(db, read):
+    """
+    Peak memory allocated while running read() with a fresh session,
+    as a request would.
+    """
+    db.session.remove()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    result = read()
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    db.session.remove()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory benchmark for ORM reads")
+    parser.add_argument("--blogs", type=int, default=2000)
+    parser.add_argument("--bookings", type=int, default=20000)
+    args = parser.parse_args()
+
+    # The seeded database is several MB, so it is removed afterwards
+    with tempfile.TemporaryDirectory(prefix="portfolio-bench-") as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        os.environ.setdefault("JINJA_CACHE_DIR", os.path.join(workdir, "jinja_cache"))
+
+        # Imported after DATABASE_URL is set, server creates the tables on import
+        from server import server
+        from models import db, Blog, Booking
+
+        with server.app_context():
+            seed(db, Blog, Booking, args.blogs, args.bookings)
+
+            cases = [
+                (
+                    "sitemap: latest blog update",
+                    lambda: max(blog.updated_at for blog in Blog.get_published()),
+                    Blog.get_latest_update,
+                ),
+                (
+                    "blog page: published blogs",
+                    Blog.get_published,
+                    Blog.get_published_cards,
+                ),
+                (
+                    "admin: all bookings",
+                    Booking.get_all,
+                    Booking.get_all_rows,
+                ),
+            ]
+
+            print(f"{args.blogs} blogs, {args.bookings} bookings (peak KiB per request)")
+            print(f"{'read path':32} {'ORM':>10} {'projection':>12} {'saved':>8}")
+
+            for name, before, after in cases:
+                orm_peak = peak_allocation(db, before)
+                projection_peak = peak_allocation(db, after)
+                saved = 100 * (1 - projection_peak / orm_peak)
+
+                print(
+                    f"{name:32} {orm_peak / 1024:>10.0f} "
+                    f"{projection_peak / 1024:>12.0f} {saved:>7.0f}%"
+                )
+
+            # Close pooled connections before the directory is removed
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
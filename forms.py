@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField
 from wtforms.fields.simple import SubmitField
-from wtforms.validators import DataRequired, Email, Length
+from wtforms.validators import DataRequired, Email, Length, Optional
 
 
 class ContactForm(FlaskForm):
@@ -35,6 +35,13 @@ class BookingForm(FlaskForm):
     exam_board = StringField("Exam board", validators=[Length(max=60)])
     email = StringField("Email", validators=[DataRequired(), Email(), Length(max=120)])
     preferred_times = StringField("Preferred days/times", validators=[Length(max=200)])
+    # Choices are the currently free slots, filled in by the route
+    slot_id = SelectField(
+        "Available slot (optional)",
+        choices=[("", "No specific slot")],
+        coerce=lambda value: int(value) if value else None,
+        validators=[Optional()],
+    )
     message = TextAreaField("Topics / message", validators=[DataRequired(), Length(max=2000)])
 
 
@@ -0,0 +1,84 @@
+# fragment_cache.py
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+
+class FragmentCache:
+    """
+    Small in-process store for rendered template fragments.
+    Least recently used entries are dropped once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FragmentCacheExtension(Extension):
+    """
+    Adds a {% cache %} tag that renders a block once and reuses the HTML.
+
+    Usage:
+        {% cache "footer", 1, year %}
+          ...
+        {% endcache %}
+
+    The first argument is the key and the second the version. Bump the
+    version when the markup inside the block changes. Any further
+    arguments are values the block depends on (e.g. the current endpoint),
+    each combination is cached separately.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+
+        body = parser.parse_statements(["name:endcache"], drop_needle=True)
+
+        call = self.call_method("_render_cached", [nodes.List(args)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        if len(parts) < 2:
+            raise ValueError("{% cache %} needs at least a key and a version")
+
+        key = tuple(str(part) for part in parts)
+        cache = self.environment.fragment_cache
+
+        html = cache.get(key)
+        if html is None:
+            html = caller()
+            cache.set(key, html)
+
+        return html
@@ -0,0 +1,174 @@
+# http_cache.py
+import json
+import os
+import urllib.request
+
+from flask import current_app, g, request
+
+
+class CachePolicy:
+    """
+    HTTP caching rules for one route.
+
+    max_age is for browsers, s_maxage for shared caches/CDNs. CDN copies
+    can be kept much longer because they are purged by surrogate key
+    whenever the content changes.
+    """
+
+    def __init__(
+        self,
+        public=False,
+        max_age=0,
+        s_maxage=None,
+        stale_while_revalidate=None,
+        stale_if_error=None,
+        vary=(),
+        surrogate_keys=(),
+        no_store=False,
+    ):
+        self.public = public
+        self.max_age = max_age
+        self.s_maxage = s_maxage
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.vary = tuple(vary)
+        self.surrogate_keys = tuple(surrogate_keys)
+        self.no_store = no_store
+
+    def cache_control(self):
+        if self.no_store:
+            return "no-store"
+
+        if not self.public:
+            # Browser may keep it but must revalidate, shared caches must not store it
+            return "private, no-cache"
+
+        parts = ["public", f"max-age={self.max_age}"]
+        if self.s_maxage is not None:
+            parts.append(f"s-maxage={self.s_maxage}")
+        if self.stale_while_revalidate is not None:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        if self.stale_if_error is not None:
+            parts.append(f"stale-if-error={self.stale_if_error}")
+        return ", ".join(parts)
+
+
+# Per-route policies, keyed by endpoint name.
+# Only routes that never read or write the session may be public.
+# "/" and "/tutoring" contain forms with a per-session CSRF token,
+# so they cannot be shared between visitors and stay private.
+CACHE_POLICIES = {
+    "get_blog": CachePolicy(
+        public=True,
+        max_age=300,
+        s_maxage=86400,
+        stale_while_revalidate=600,
+        stale_if_error=86400,
+        vary=("Accept-Encoding",),
+        surrogate_keys=("blog",),
+    ),
+    "sitemap": CachePolicy(
+        public=True,
+        max_age=3600,
+        s_maxage=86400,
+        stale_while_revalidate=3600,
+        surrogate_keys=("blog", "sitemap"),
+    ),
+    "tutoring_availability": CachePolicy(
+        public=True,
+        max_age=30,
+        s_maxage=300,
+        stale_while_revalidate=30,
+        vary=("Accept-Encoding",),
+        surrogate_keys=("availability",),
+    ),
+    "index": CachePolicy(vary=("Cookie",)),
+    "tutoring": CachePolicy(vary=("Cookie",)),
+    "admin_bookings": CachePolicy(no_store=True),
+    "admin_booking_status": CachePolicy(no_store=True),
+    "admin_pending_reviews": CachePolicy(no_store=True),
+    "admin_moderate_reviews": CachePolicy(no_store=True),
+    "healthz": CachePolicy(no_store=True),
+    "readyz": CachePolicy(no_store=True),
+}
+
+
+def add_surrogate_keys(*keys):
+    """
+    Tags the current response with extra surrogate keys,
+    e.g. one per blog shown on the page ("blog:<slug>").
+    """
+    g.setdefault("surrogate_keys", []).extend(keys)
+
+
+def apply_cache_policy(response):
+    """
+    after_request hook: sets Cache-Control, Vary and surrogate key
+    headers from the policy for the current endpoint.
+    """
+    policy = CACHE_POLICIES.get(request.endpoint)
+
+    # Only successful GET/HEAD responses are cacheable, and a view
+    # that set its own Cache-Control knows better.
+    if (
+        policy is None
+        or request.method not in ("GET", "HEAD")
+        or response.status_code != 200
+        or "Cache-Control" in response.headers
+    ):
+        return response
+
+    response.headers["Cache-Control"] = policy.cache_control()
+
+    for header in policy.vary:
+        response.vary.add(header)
+
+    # Only responses a CDN may store are worth tagging
+    keys = list(policy.surrogate_keys) + g.get("surrogate_keys", [])
+    if keys and policy.public:
+        # Fastly reads Surrogate-Key (space separated),
+        # Cloudflare reads Cache-Tag (comma separated).
+        response.headers["Surrogate-Key"] = " ".join(keys)
+        response.headers["Cache-Tag"] = ",".join(keys)
+
+    # ETag lets caches revalidate stale copies with a cheap 304
+    if policy.public:
+        response.add_etag()
+        response.make_conditional(request)
+
+    return response
+
+
+def purge_surrogate_keys(keys):
+    """
+    Asks the CDN to drop everything tagged with these keys.
+
+    Sends {"surrogate_keys": [...]} to CDN_PURGE_URL (with CDN_PURGE_TOKEN
+    as a bearer token). Does nothing when no CDN is configured.
+    A failed purge is logged, not raised: the content change itself has
+    already been saved and cached copies will still expire.
+    """
+    purge_url = os.environ.get("CDN_PURGE_URL")
+    keys = sorted(set(keys))
+
+    if not purge_url or not keys:
+        return False
+
+    purge_request = urllib.request.Request(
+        purge_url,
+        data=json.dumps({"surrogate_keys": keys}).encode(),
+        headers={
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {os.environ.get('CDN_PURGE_TOKEN', '')}",
+        },
+        method="POST",
+    )
+
+    try:
+        with urllib.request.urlopen(purge_request, timeout=5):
+            pass
+    except OSError:
+        current_app.logger.exception("CDN purge failed for %s", keys)
+        return False
+
+    return True
@@ -0,0 +1,79 @@
+from server import server
+from availability import add_slot, get_slot_index, remove_slot, slot_label, week_bounds
+from http_cache import purge_surrogate_keys
+from datetime import date, datetime, timedelta
+import argparse
+
+
+def list_slots(weeks):
+    """
+    Prints slots from the start of this week, marking booked ones.
+    """
+    starts_at, _ = week_bounds(date.today())
+    ends_at = starts_at + timedelta(weeks=weeks)
+
+    entries = get_slot_index().overlapping(starts_at, ends_at)
+    if not entries:
+        print("No slots")
+        return
+
+    for entry in entries:
+        status = "booked" if entry.booked else "free"
+        print(f"[{entry.id}] {slot_label(entry)} - {status}")
+
+
+def main():
+    """
+    Entry point for managing tutoring availability.
+
+    Examples:
+        python manage_availability.py list
+        python manage_availability.py add 2026-01-05T17:00 --minutes 60 --level gcse
+        python manage_availability.py add 2026-01-05T17:00 --weekly 6
+        python manage_availability.py remove 12
+    """
+    parser = argparse.ArgumentParser(description="Manage tutoring availability slots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="show slots from this week on")
+    listing.add_argument("--weeks", type=int, default=2)
+
+    add = commands.add_parser("add", help="add a slot (refused if it overlaps another)")
+    add.add_argument("starts_at", type=datetime.fromisoformat)
+    add.add_argument("--minutes", type=int, default=60)
+    add.add_argument("--level", choices=["gcse", "alevel"], help="leave out for any level")
+    add.add_argument("--weekly", type=int, default=1, help="repeat for this many weeks")
+
+    remove = commands.add_parser("remove", help="remove an unbooked slot")
+    remove.add_argument("slot_id", type=int)
+
+    args = parser.parse_args()
+
+    with server.app_context():
+        if args.command == "list":
+            list_slots(args.weeks)
+
+        elif args.command == "add":
+            for week in range(args.weekly):
+                starts_at = args.starts_at + timedelta(weeks=week)
+                ends_at = starts_at + timedelta(minutes=args.minutes)
+
+                try:
+                    slot = add_slot(starts_at, ends_at, args.level)
+                    print(f"Added slot {slot.id} at {starts_at:%Y-%m-%d %H:%M}")
+                except ValueError as exc:
+                    print(f"Skipped {starts_at:%Y-%m-%d %H:%M}: {exc}")
+
+            purge_surrogate_keys(["availability"])
+
+        elif args.command == "remove":
+            try:
+                remove_slot(args.slot_id)
+                print(f"Removed slot {args.slot_id}")
+                purge_surrogate_keys(["availability"])
+            except ValueError as exc:
+                print(exc)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from server import server
 from models import db, Blog
+from http_cache import purge_surrogate_keys
 import math
 
 
@@ -77,6 +78,9 @@ def main():
     """
 
     with server.app_context():
+        # Slugs before the reset, so removed blogs are purged from the CDN too
+        old_slugs = [slug for (slug,) in db.session.query(Blog.slug)]
+
         clear_blogs()
 
         upsert_blog(
@@ -185,6 +189,12 @@ Portfolio projects are training grounds. Writing documentation builds habits tha
         db.session.commit()
         print("Blog content updated successfully")
 
+        new_slugs = [slug for (slug,) in db.session.query(Blog.slug)]
+        purge_surrogate_keys(
+            ["blog", "sitemap"]
+            + [f"blog:{slug}" for slug in old_slugs + new_slugs]
+        )
+
 
 if __name__ == "__main__":
     main()
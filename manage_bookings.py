@@ -0,0 +1,65 @@
+from server import server
+from models import Booking
+import argparse
+
+
+def list_bookings(status=None):
+    """
+    Prints bookings, newest first, optionally only one status.
+    """
+    bookings = [
+        booking for booking in Booking.get_all_rows()
+        if status is None or booking.status == status
+    ]
+
+    if not bookings:
+        print("No bookings")
+        return
+
+    for booking in bookings:
+        slot = f" slot={booking.slot_id}" if booking.slot_id else ""
+        print(
+            f"[{booking.id}] {booking.name} <{booking.email}> "
+            f"{booking.level} - {booking.status}{slot} - {booking.created_at:%Y-%m-%d}"
+        )
+
+
+def main():
+    """
+    Entry point for managing tutoring bookings from the command line.
+
+    Examples:
+        python manage_bookings.py list --status pending
+        python manage_bookings.py confirm 3 4 5
+        python manage_bookings.py cancel 6
+    """
+    parser = argparse.ArgumentParser(description="Manage tutoring bookings")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="show bookings")
+    listing.add_argument("--status", choices=Booking.STATUSES)
+
+    confirm = commands.add_parser("confirm", help="confirm bookings by id")
+    confirm.add_argument("ids", nargs="+", type=int)
+
+    cancel = commands.add_parser("cancel", help="cancel bookings by id")
+    cancel.add_argument("ids", nargs="+", type=int)
+
+    args = parser.parse_args()
+
+    with server.app_context():
+        if args.command == "list":
+            list_bookings(args.status)
+            return
+
+        try:
+            if args.command == "confirm":
+                print(f"Confirmed {Booking.confirm_many(args.ids)} booking(s)")
+            else:
+                print(f"Cancelled {Booking.cancel_many(args.ids)} booking(s)")
+        except ValueError as exc:
+            print(f"Nothing changed: {exc}")
+
+
+if __name__ == "__main__":
+    main()
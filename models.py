@@ -1,12 +1,30 @@
 # models.py
 from flask_sqlalchemy import SQLAlchemy
+from collections import namedtuple
 from datetime import datetime
 
+from sqlalchemy.exc import IntegrityError
+
+from http_cache import purge_surrogate_keys
+
 # This db object is shared across the app
 # (equivalent to EntityManagerFactory / SessionFactory)
 db = SQLAlchemy()
 
 
+# Read-only row records for hot read paths.
+# Plain tuples with only the columns a page needs, no ORM instance,
+# identity map entry or change tracking per row.
+BookingRow = namedtuple(
+    "BookingRow",
+    "id name level exam_board email preferred_times message status slot_id created_at"
+)
+BlogCard = namedtuple(
+    "BlogCard",
+    "slug card_position title meta summary read_time content"
+)
+
+
 class Booking(db.Model):
     """
     Booking model
@@ -15,6 +33,8 @@ class Booking(db.Model):
 
     __tablename__ = "bookings"
 
+    STATUSES = ("pending", "confirmed", "cancelled")
+
     id = db.Column(db.Integer, primary_key=True)
 
     name = db.Column(db.String(80), nullable=False)
@@ -24,6 +44,10 @@ class Booking(db.Model):
     preferred_times = db.Column(db.String(200))
     message = db.Column(db.Text, nullable=False)
 
+    # Optional structured time slot (preferred_times stays as free text)
+    slot_id = db.Column(db.Integer, db.ForeignKey("availability_slots.id"))
+    slot = db.relationship("AvailabilitySlot", back_populates="bookings")
+
     status = db.Column(
         db.String(20),
         nullable=False,
@@ -36,6 +60,18 @@ class Booking(db.Model):
         default=datetime.utcnow
     )
 
+    # A slot can only hold one active booking. Enforced by the database
+    # so two requests racing for the same slot cannot both succeed.
+    __table_args__ = (
+        db.Index(
+            "ux_bookings_active_slot",
+            "slot_id",
+            unique=True,
+            sqlite_where=db.text("slot_id IS NOT NULL AND status != 'cancelled'"),
+            postgresql_where=db.text("slot_id IS NOT NULL AND status != 'cancelled'"),
+        ),
+    )
+
     def __repr__(self):
         return (
             f"<Booking id={self.id} "
@@ -49,9 +85,17 @@ class Booking(db.Model):
         db.session.commit()
 
     def delete(self):
+        # Deleting a booking frees its slot, same as cancelling it
+        slot_id = self.slot_id
+        if slot_id is not None:
+            AvailabilitySlot.touch_many([slot_id])
+
         db.session.delete(self)
         db.session.commit()
 
+        if slot_id is not None:
+            purge_surrogate_keys(["availability"])
+
     @classmethod
     def get_by_id(cls, booking_id: int):
         return cls.query.get(booking_id)
@@ -60,6 +104,18 @@ class Booking(db.Model):
     def get_all(cls):
         return cls.query.order_by(cls.created_at.desc()).all()
 
+    @classmethod
+    def get_all_rows(cls):
+        """
+        Same as get_all() but returns BookingRow tuples,
+        for read-only listings such as the admin view.
+        """
+        columns = [getattr(cls, name) for name in BookingRow._fields]
+        result = db.session.execute(
+            db.select(*columns).order_by(cls.created_at.desc())
+        )
+        return [BookingRow._make(row) for row in result]
+
     @classmethod
     def get_recent(cls, limit: int = 10):
         return (
@@ -102,12 +158,145 @@ class Booking(db.Model):
 
     def mark_cancelled(self):
         self.status = "cancelled"
+        if self.slot is not None:
+            self.slot.updated_at = datetime.utcnow()
         db.session.commit()
 
+        if self.slot_id is not None:
+            purge_surrogate_keys(["availability"])
+
+    @classmethod
+    def set_status_many(cls, booking_ids, status: str) -> int:
+        """
+        Updates the status of many bookings in a single UPDATE
+        instead of one commit per row. Returns the number of rows changed.
+
+        Raises ValueError for an unknown status, or when re-activating a
+        booking whose slot has since been taken by another booking
+        (nothing is changed in that case).
+        """
+        if status not in cls.STATUSES:
+            raise ValueError(f"Unknown booking status: {status}")
+
+        if not booking_ids:
+            return 0
+
+        try:
+            count = (
+                cls.query
+                .filter(cls.id.in_(booking_ids))
+                .update({cls.status: status}, synchronize_session=False)
+            )
+
+            # Cancelling frees the booked slots (and re-activating takes
+            # them again), so their availability changes
+            touched = AvailabilitySlot.touch_many(
+                db.select(cls.slot_id)
+                .where(cls.id.in_(booking_ids), cls.slot_id.is_not(None))
+            )
+            db.session.commit()
+
+        except IntegrityError:
+            # ux_bookings_active_slot: a slot can only hold one active booking
+            db.session.rollback()
+            raise ValueError(
+                "A booking's slot is already taken by another active booking"
+            )
+
+        if touched:
+            purge_surrogate_keys(["availability"])
+
+        return count
+
+    @classmethod
+    def confirm_many(cls, booking_ids) -> int:
+        return cls.set_status_many(booking_ids, "confirmed")
+
+    @classmethod
+    def cancel_many(cls, booking_ids) -> int:
+        return cls.set_status_many(booking_ids, "cancelled")
+
     def is_alevel(self) -> bool:
         return self.level == "alevel"
 
 
+class AvailabilitySlot(db.Model):
+    """
+    A time slot offered for tutoring.
+
+    level is None when the slot is open to any level.
+    A slot is free while it has no booking that is still active.
+    """
+
+    __tablename__ = "availability_slots"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    starts_at = db.Column(db.DateTime, nullable=False, index=True)
+    ends_at = db.Column(db.DateTime, nullable=False)
+    level = db.Column(db.String(20))
+
+    bookings = db.relationship("Booking", back_populates="slot")
+
+    # Bumped whenever the slot or its bookings change,
+    # used to tell when cached availability is out of date.
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<AvailabilitySlot id={self.id} starts_at={self.starts_at} level={self.level}>"
+
+    @classmethod
+    def get_by_id(cls, slot_id: int):
+        return db.session.get(cls, slot_id)
+
+    @classmethod
+    def get_all_with_booked_flag(cls):
+        """
+        Returns (slot, is_booked) rows in start order.
+        One query, used to build the in-memory slot index.
+        """
+        active_booking = (
+            db.select(Booking.id)
+            .where(
+                Booking.slot_id == cls.id,
+                Booking.status != "cancelled"
+            )
+            .exists()
+        )
+
+        return db.session.execute(
+            db.select(cls, active_booking).order_by(cls.starts_at)
+        ).all()
+
+    @classmethod
+    def get_version(cls):
+        """
+        Cheap stamp that changes whenever slots are added, removed
+        or booked (count + latest updated_at).
+        """
+        return db.session.execute(
+            db.select(db.func.count(cls.id), db.func.max(cls.updated_at))
+        ).one()
+
+    @classmethod
+    def touch_many(cls, slot_ids):
+        """
+        Marks slots as changed. slot_ids can be a list or a subquery.
+        Does not commit, the caller's transaction does.
+        Returns the number of slots touched.
+        """
+        return (
+            cls.query
+            .filter(cls.id.in_(slot_ids))
+            .update({cls.updated_at: datetime.utcnow()}, synchronize_session=False)
+        )
+
+
 class Blog(db.Model):
     """
     Blog model
@@ -155,10 +344,46 @@ class Blog(db.Model):
             .all()
         )
 
+    @classmethod
+    def get_published_cards(cls):
+        """
+        Published blogs as BlogCard tuples with only the columns
+        the blog page renders.
+        """
+        columns = [getattr(cls, name) for name in BlogCard._fields]
+        result = db.session.execute(
+            db.select(*columns)
+            .where(cls.published.is_(True))
+            .order_by(cls.card_position)
+        )
+        return [BlogCard._make(row) for row in result]
+
+    @classmethod
+    def get_latest_update(cls):
+        """
+        Most recent updated_at across published blogs (None if there are none).
+        Computed by the database, no rows are loaded.
+        """
+        return db.session.execute(
+            db.select(db.func.max(cls.updated_at))
+            .where(cls.published.is_(True))
+        ).scalar()
+
 
 class Review(db.Model):
     __tablename__ = "reviews"
 
+    # Partial index: only approved reviews are ever listed publicly,
+    # newest first, so pending rows are kept out of the index entirely.
+    __table_args__ = (
+        db.Index(
+            "ix_reviews_approved_created_at",
+            "created_at",
+            sqlite_where=db.text("approved = 1"),
+            postgresql_where=db.text("approved"),
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     name = db.Column(db.String(80), nullable=False)
@@ -180,6 +405,49 @@ class Review(db.Model):
         db.session.add(self)
         db.session.commit()
 
+    @classmethod
+    def approve_many(cls, review_ids) -> int:
+        """
+        Approves many reviews in a single UPDATE.
+        Returns the number of rows changed.
+        """
+        if not review_ids:
+            return 0
+
+        count = (
+            cls.query
+            .filter(cls.id.in_(review_ids))
+            .update({cls.approved: True}, synchronize_session=False)
+        )
+        db.session.commit()
+        return count
+
+    @classmethod
+    def reject_many(cls, review_ids) -> int:
+        """
+        Rejected reviews are not kept, so they are deleted
+        in a single DELETE. Returns the number of rows removed.
+        """
+        if not review_ids:
+            return 0
+
+        count = (
+            cls.query
+            .filter(cls.id.in_(review_ids))
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        return count
+
+    @classmethod
+    def get_pending(cls):
+        return (
+            cls.query
+            .filter_by(approved=False)
+            .order_by(cls.created_at)
+            .all()
+        )
+
     @classmethod
     def get_approved(cls):
         return (
@@ -188,3 +456,89 @@ class Review(db.Model):
             .order_by(cls.created_at.desc())
             .all()
         )
+
+
+class PageFragment(db.Model):
+    """
+    Pre-rendered piece of HTML stored by key.
+
+    Used for parts of a page that only change when an admin action
+    happens (e.g. approving reviews), so they are rendered once at that
+    point instead of on every request.
+    """
+
+    __tablename__ = "page_fragments"
+
+    key = db.Column(db.String(100), primary_key=True)
+    html = db.Column(db.Text, nullable=False)
+
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        return f"<PageFragment key={self.key}>"
+
+    @classmethod
+    def get_html(cls, key: str):
+        fragment = db.session.get(cls, key)
+        return fragment.html if fragment else None
+
+    @classmethod
+    def store(cls, key: str, html: str):
+        fragment = db.session.get(cls, key)
+
+        if fragment:
+            fragment.html = html
+            db.session.commit()
+            return
+
+        try:
+            db.session.add(cls(key=key, html=html))
+            db.session.commit()
+        except IntegrityError:
+            # Another request stored the same key first (e.g. two first
+            # loads of /tutoring on a fresh database), so update that row.
+            db.session.rollback()
+            (
+                cls.query
+                .filter_by(key=key)
+                .update({cls.html: html, cls.updated_at: datetime.utcnow()})
+            )
+            db.session.commit()
+
+
+def add_missing_columns():
+    """
+    db.create_all() does not alter existing tables, so nullable columns
+    added to a model later are added here with ALTER TABLE.
+    """
+    inspector = db.inspect(db.engine)
+
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(db.text(
+                    f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                ))
+
+
+def create_missing_indexes():
+    """
+    db.create_all() skips tables that already exist, including their
+    indexes, so indexes added later are created here separately.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
@@ -0,0 +1,72 @@
+from server import server
+from models import Review
+from reviews import moderate_reviews, render_reviews_fragment
+import argparse
+
+
+def list_pending():
+    """
+    Prints reviews waiting for approval, oldest first.
+    """
+    reviews = Review.get_pending()
+
+    if not reviews:
+        print("No reviews awaiting approval")
+        return
+
+    for review in reviews:
+        role = f" ({review.role})" if review.role else ""
+        print(f"[{review.id}] {review.name}{role} - {review.created_at:%Y-%m-%d}")
+        print(f"    {review.message}")
+
+
+def main():
+    """
+    Entry point for moderating reviews from the command line.
+
+    Examples:
+        python moderate_reviews.py list
+        python moderate_reviews.py approve 3 4 5
+        python moderate_reviews.py approve --all
+        python moderate_reviews.py reject 6
+        python moderate_reviews.py render
+    """
+    parser = argparse.ArgumentParser(description="Moderate tutoring reviews")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="show reviews awaiting approval")
+
+    approve = commands.add_parser("approve", help="approve reviews by id")
+    approve.add_argument("ids", nargs="*", type=int)
+    approve.add_argument("--all", action="store_true", help="approve every pending review")
+
+    reject = commands.add_parser("reject", help="reject (delete) reviews by id")
+    reject.add_argument("ids", nargs="+", type=int)
+
+    commands.add_parser("render", help="re-render the stored reviews fragment")
+
+    args = parser.parse_args()
+
+    with server.app_context():
+        if args.command == "list":
+            list_pending()
+
+        elif args.command == "approve":
+            ids = args.ids
+            if args.all:
+                ids = [review.id for review in Review.get_pending()]
+
+            result = moderate_reviews(approve_ids=ids)
+            print(f"Approved {result['approved']} review(s)")
+
+        elif args.command == "reject":
+            result = moderate_reviews(reject_ids=args.ids)
+            print(f"Rejected {result['rejected']} review(s)")
+
+        elif args.command == "render":
+            render_reviews_fragment()
+            print("Reviews fragment updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# reviews.py
+from flask import render_template
+from markupsafe import Markup
+
+from models import Review, PageFragment
+
+# Key the rendered carousel is stored under in page_fragments
+REVIEWS_FRAGMENT_KEY = "tutoring:reviews"
+
+
+def render_reviews_fragment():
+    """
+    Renders the approved reviews carousel and stores the HTML.
+
+    This runs when reviews are moderated, not when /tutoring is loaded,
+    so the sort and render over every review happens once per change.
+    Needs an app context (render_template).
+    """
+    html = render_template(
+        "partials/_reviews.html",
+        reviews=Review.get_approved()
+    )
+    PageFragment.store(REVIEWS_FRAGMENT_KEY, html)
+    return html
+
+
+def get_reviews_fragment():
+    """
+    Returns the stored reviews carousel for the tutoring page.
+    Falls back to rendering it (and storing it) if nothing is stored yet,
+    e.g. on a fresh database.
+    """
+    html = PageFragment.get_html(REVIEWS_FRAGMENT_KEY)
+
+    if html is None:
+        html = render_reviews_fragment()
+
+    # Stored HTML was already escaped by Jinja when it was rendered
+    return Markup(html)
+
+
+def moderate_reviews(approve_ids=(), reject_ids=()):
+    """
+    Approves and rejects reviews in bulk, then re-renders the fragment
+    once for the whole batch. Returns the number of rows changed.
+    """
+    approved = Review.approve_many(list(approve_ids))
+    rejected = Review.reject_many(list(reject_ids))
+
+    if approved or rejected:
+        render_reviews_fragment()
+
+    return {"approved": approved, "rejected": rejected}
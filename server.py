@@ -4,9 +4,12 @@ from dotenv import load_dotenv
 # Load environment variables from .env
 load_dotenv()
 
+import hmac
 import smtplib
+from concurrent.futures import TimeoutError as WriteTimeout
 from email.message import EmailMessage
 from datetime import date, datetime
+from functools import lru_cache
 from flask import Flask, render_template
 from flask import Response
 
@@ -17,10 +20,22 @@ from flask import send_from_directory
 from forms import ContactForm, BookingForm, ReviewForm
 
 # Database models
-from models import db, Booking, Blog, Review
-
+from models import db, Booking, Blog, Review, AvailabilitySlot
+from models import add_missing_columns, create_missing_indexes
+from availability import free_slots_for_week, get_slot_index, upcoming_slot_choices
+from batch_writer import GroupCommitWriter
+from warmup import WarmUp
+from http_cache import add_surrogate_keys, apply_cache_policy, purge_surrogate_keys
+from reviews import get_reviews_fragment, moderate_reviews
+
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from flask import flash, redirect, url_for
+from flask import abort, jsonify, request
+from jinja2 import FileSystemBytecodeCache
+
+# Template fragment caching ({% cache %} tag)
+from fragment_cache import FragmentCacheExtension
 
 
 # Flask application
@@ -31,6 +46,21 @@ server.config["SECRET_KEY"] = os.environ.get(
     "SECRET_KEY", "dev-secret-key-change-me"
 )
 
+# Template caching.
+# Compiled templates are stored on disk so new workers load bytecode
+# instead of compiling every template again at startup.
+JINJA_CACHE_DIR = os.environ.get(
+    "JINJA_CACHE_DIR",
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), "instance", "jinja_cache")
+)
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+server.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+server.jinja_env.add_extension(FragmentCacheExtension)
+
+# HTTP caching headers (Cache-Control, Vary, surrogate keys) per route,
+# see CACHE_POLICIES in http_cache.py
+server.after_request(apply_cache_policy)
+
 
 @server.route("/sitemap.xml")
 def sitemap():
@@ -48,10 +78,9 @@ def sitemap():
     ]
 
     # Blog page last modified = most recent blog update
-    blogs = Blog.get_published()
+    latest_blog_update = Blog.get_latest_update()
     # Google to know when blog content changed
-    if blogs:
-        latest_blog_update = max(blog.updated_at for blog in blogs)
+    if latest_blog_update:
         blog_lastmod = latest_blog_update.date().isoformat()
     else:
         blog_lastmod = date.today().isoformat()
@@ -68,7 +97,8 @@ def sitemap():
 
 @server.route("/robots.txt")
 def robots():
-    return send_from_directory("static", "robots.txt")
+    # Served with its own caching headers (one day, public)
+    return send_from_directory("static", "robots.txt", max_age=86400)
 
 
 # Database configuration
@@ -89,6 +119,55 @@ db.init_app(server)
 # Had issues with blog table not existing when updating blog as it is dropped. Only creates missing ones
 with server.app_context():
     db.create_all()
+    add_missing_columns()
+    create_missing_indexes()
+
+
+# Optional group commit for form submissions.
+# When GROUP_COMMIT_WINDOW_MS is set, inserts from concurrent requests are
+# collected for that many milliseconds and committed in one transaction.
+GROUP_COMMIT_WINDOW_MS = int(os.environ.get("GROUP_COMMIT_WINDOW_MS", "0"))
+group_writer = (
+    GroupCommitWriter(server, window_ms=GROUP_COMMIT_WINDOW_MS)
+    if GROUP_COMMIT_WINDOW_MS > 0
+    else None
+)
+
+
+# Warm-up before taking traffic.
+# Starts on the first /readyz call (load balancer health check), or straight
+# away when WARM_UP_ON_START is set. CLI scripts importing server skip it.
+warm_up = WarmUp(server)
+if os.environ.get("WARM_UP_ON_START") == "1":
+    warm_up.start()
+
+
+def save_record(model, values, on_insert=None):
+    """
+    Inserts one row and returns its id.
+    on_insert(record), if given, runs in the same transaction as the insert.
+    Goes through the group-commit writer when it is enabled,
+    otherwise commits straight away in this request's session.
+    """
+    if group_writer is not None:
+        # Give this request's pooled connection back before waiting,
+        # otherwise a burst of waiting requests can hold every connection
+        # and leave the writer thread unable to commit their rows.
+        db.session.close()
+
+        # Waits for the batch containing this row to be committed.
+        # Any database error is re-raised here, in the request.
+        # On WriteTimeout the outcome is unknown: the writer may still
+        # commit the row later, so callers must not retry it themselves.
+        return group_writer.submit(model, values, on_insert).result(timeout=10)
+
+    record = model(**values)
+    db.session.add(record)
+    db.session.flush()
+    if on_insert is not None:
+        on_insert(record)
+    db.session.commit()
+    return record.id
 
 
 # Reads SMTP config from environment.
@@ -135,7 +214,14 @@ def common_context():
     """
     Shared data available to all templates
     """
-    skills = [
+    # Copied so a route adding keys cannot change the cached dict
+    return dict(_common_context_for_year(date.today().year))
+
+
+# Built once per process (and again only when the year changes)
+@lru_cache(maxsize=1)
+def _common_context_for_year(year):
+    skills = (
         ("Java", "java.webp"),
         ("SpringBoot", "spring.webp"),
         ("Typescript", "Typescript.webp"),
@@ -150,10 +236,10 @@ def common_context():
         ("Git", "git.webp"),
         ("GitHub", "GitHub.webp"),
         ("Teaching & Mentoring", "teach-code.webp"),
-    ]
+    )
 
     return {
-        "year": datetime.now().year,
+        "year": year,
         "skills": skills,
     }
 
@@ -213,6 +299,10 @@ def tutoring():
     booking_form = BookingForm(prefix="booking")
     review_form = ReviewForm(prefix="review")
 
+    # Free slots for the next two weeks (served from the cached slot index)
+    slot_choices = upcoming_slot_choices()
+    booking_form.slot_id.choices = [("", "No specific slot")] + slot_choices
+
     # Review form handling.
     # submit.data is checked so this block only runs when
     # the review form was the one submitted.
@@ -225,18 +315,16 @@ def tutoring():
                 else None
             )
 
-            review = Review(
-                name=review_form.name.data,
-                role=role,
-                message=review_form.message.data
-            )
+            save_record(Review, {
+                "name": review_form.name.data,
+                "role": role,
+                "message": review_form.message.data,
+            })
 
-            db.session.add(review)
-            db.session.commit()
-
-        except SQLAlchemyError:
+        except (SQLAlchemyError, WriteTimeout):
             # Database errors are handled explicitly to keep
             # the transaction state consistent.
+            # A timeout means the review may or may not have been saved.
             db.session.rollback()
             server.logger.exception("Review submission failed")
             flash("Sorry, your review could not be submitted.", "error")
@@ -270,20 +358,38 @@ Message:
     # Booking form handling.
     # This runs only when the booking form is submitted.
     if booking_form.validate_on_submit():
+        slot_id = booking_form.slot_id.data
+
+        # The slot may have been taken (or not suit this level) since the page loaded
+        if slot_id and not get_slot_index().is_free_for(slot_id, booking_form.level.data):
+            flash("Sorry, that slot is no longer available for this level.", "error")
+            return redirect(url_for("tutoring", _anchor="booking-form"))
+
         try:
-            booking = Booking(
-                name=booking_form.name.data,
-                level=booking_form.level.data,
-                exam_board=booking_form.exam_board.data,
-                email=booking_form.email.data,
-                preferred_times=booking_form.preferred_times.data,
-                message=booking_form.message.data
+            booking = {
+                "name": booking_form.name.data,
+                "level": booking_form.level.data,
+                "exam_board": booking_form.exam_board.data,
+                "email": booking_form.email.data,
+                "preferred_times": booking_form.preferred_times.data,
+                "message": booking_form.message.data,
+                "slot_id": slot_id,
+            }
+
+            # Lets cached availability know this slot is now taken.
+            # Runs in the booking's own transaction, so both commit or neither.
+            touch_slot = (
+                (lambda record: AvailabilitySlot.touch_many([record.slot_id]))
+                if slot_id
+                else None
             )
+            save_record(Booking, booking, on_insert=touch_slot)
 
-            db.session.add(booking)
-            db.session.commit()
+            if slot_id:
+                purge_surrogate_keys(["availability"])
 
-        except SQLAlchemyError:
+        except (SQLAlchemyError, WriteTimeout):
+            # A timeout means the booking may or may not have been saved.
             db.session.rollback()
             server.logger.exception("Tutoring booking failed")
             flash("Sorry, your booking could not be processed.", "error")
@@ -292,18 +398,19 @@ Message:
         try:
             body = f"""New tutoring booking request
 
-Name: {booking.name}
-Level: {booking.level}
-Email: {booking.email}
-Preferred times: {booking.preferred_times}
+Name: {booking["name"]}
+Level: {booking["level"]}
+Email: {booking["email"]}
+Preferred times: {booking["preferred_times"]}
+Slot: {dict(slot_choices).get(str(slot_id), "None")}
 
 Message:
-{booking.message}
+{booking["message"]}
 """
             send_email(
                 subject="Tutoring booking request",
                 body=body,
-                reply_to=booking.email
+                reply_to=booking["email"]
             )
         except Exception:
             server.logger.exception("Booking saved but email failed")
@@ -314,14 +421,15 @@ Message:
         return redirect(url_for("tutoring", _anchor="booking-form"))
 
     # Page load for GET requests.
-    # Only approved reviews are displayed publicly.
-    reviews = Review.get_approved()
+    # Only approved reviews are displayed publicly. The carousel is
+    # rendered when reviews are moderated, so this is a single lookup.
+    reviews_html = get_reviews_fragment()
 
     return render_template(
         "tutoring.html",
         booking_form=booking_form,
         review_form=review_form,
-        reviews=reviews,
+        reviews_html=reviews_html,
         **ctx
     )
 
@@ -331,7 +439,7 @@ def admin_bookings():
     """
     Simple admin view for tutoring bookings
     """
-    bookings = Booking.get_all()
+    bookings = Booking.get_all_rows()
 
     return render_template(
         "admin_bookings.html",
@@ -340,6 +448,182 @@ def admin_bookings():
     )
 
 
+@server.route("/admin/bookings/status", methods=["POST"])
+def admin_booking_status():
+    """
+    Confirms or cancels bookings in bulk.
+    Body: {"ids": [ids], "status": "confirmed" | "cancelled" | "pending"}
+    """
+    require_admin_token()
+
+    data = request.get_json(silent=True) or {}
+    booking_ids = data.get("ids", [])
+    status = data.get("status")
+
+    # bool is a subclass of int, so true/false are rejected explicitly
+    valid = (
+        isinstance(booking_ids, list)
+        and all(type(i) is int for i in booking_ids)
+        and status in Booking.STATUSES
+    )
+    if not valid:
+        return jsonify(error="ids must be a list of ids and status one of "
+                             + ", ".join(Booking.STATUSES)), 400
+
+    try:
+        updated = Booking.set_status_many(booking_ids, status)
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 409
+    except SQLAlchemyError:
+        db.session.rollback()
+        server.logger.exception("Bulk booking status update failed")
+        return jsonify(error="Booking update failed"), 500
+
+    return jsonify(updated=updated, status=status)
+
+
+@server.route("/healthz")
+def healthz():
+    """
+    Liveness check: the process is serving requests and the
+    group-commit writer thread (if enabled) is still running.
+    No database or network calls, so it is always cheap.
+    """
+    if group_writer is not None and not group_writer.is_alive():
+        return jsonify(status="fail", writer="stopped"), 503
+
+    return jsonify(status="ok")
+
+
+@server.route("/readyz")
+def readyz():
+    """
+    Readiness check for the load balancer.
+    Ready once the database answers, the mail settings are present,
+    pending writes are not backing up and warm-up has finished.
+    """
+    warm_up.start()
+
+    checks = {}
+
+    try:
+        db.session.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except SQLAlchemyError:
+        db.session.rollback()
+        checks["database"] = "fail"
+
+    # Mail is sent inline, so only the configuration can be checked
+    # without opening an SMTP connection on every probe.
+    smtp_settings = ("SMTP_HOST", "SMTP_USERNAME", "SMTP_PASSWORD")
+    checks["mail"] = "ok" if all(os.environ.get(name) for name in smtp_settings) else "not configured"
+
+    if group_writer is not None:
+        backlog = group_writer.backlog()
+        checks["write_queue"] = "ok" if group_writer.is_alive() and backlog < 1000 else "fail"
+
+    if warm_up.error:
+        checks["warm_up"] = "fail"
+    else:
+        checks["warm_up"] = "ok" if warm_up.ready.is_set() else "in progress"
+
+    # Missing mail settings are reported but do not block traffic:
+    # form submissions are still saved without the email.
+    ready = all(
+        value == "ok"
+        for name, value in checks.items()
+        if name != "mail"
+    )
+
+    return jsonify(status="ok" if ready else "fail", checks=checks), 200 if ready else 503
+
+
+@server.route("/tutoring/availability")
+def tutoring_availability():
+    """
+    Free tutoring slots as JSON.
+    Query params: level (gcse/alevel, optional), week (any ISO date in
+    the week, defaults to this week).
+    """
+    level = request.args.get("level") or None
+    week = request.args.get("week")
+
+    try:
+        day = date.fromisoformat(week) if week else date.today()
+    except ValueError:
+        return jsonify(error="week must be an ISO date, e.g. 2026-01-05"), 400
+
+    # Unknown levels and far-off weeks are refused before anything is cached
+    try:
+        return jsonify(free_slots_for_week(level, day))
+    except ValueError as exc:
+        return jsonify(error=str(exc)), 400
+
+
+def require_admin_token():
+    """
+    Admin API requests must send the ADMIN_TOKEN value in the
+    X-Admin-Token header. The API is disabled when ADMIN_TOKEN is not set.
+    """
+    expected = os.environ.get("ADMIN_TOKEN")
+    given = request.headers.get("X-Admin-Token", "")
+
+    if not expected or not hmac.compare_digest(given, expected):
+        abort(403)
+
+
+@server.route("/admin/reviews")
+def admin_pending_reviews():
+    """
+    Lists reviews waiting for moderation
+    """
+    require_admin_token()
+
+    reviews = [
+        {
+            "id": review.id,
+            "name": review.name,
+            "role": review.role,
+            "message": review.message,
+            "created_at": review.created_at.isoformat(),
+        }
+        for review in Review.get_pending()
+    ]
+
+    return jsonify(reviews=reviews)
+
+
+@server.route("/admin/reviews/moderate", methods=["POST"])
+def admin_moderate_reviews():
+    """
+    Approves and/or rejects reviews in bulk.
+    Body: {"approve": [ids], "reject": [ids]}
+    """
+    require_admin_token()
+
+    data = request.get_json(silent=True) or {}
+    approve_ids = data.get("approve", [])
+    reject_ids = data.get("reject", [])
+
+    valid = (
+        isinstance(approve_ids, list)
+        and isinstance(reject_ids, list)
+        # bool is a subclass of int, so true/false are rejected explicitly
+        and all(type(i) is int for i in approve_ids + reject_ids)
+    )
+    if not valid:
+        return jsonify(error="approve and reject must be lists of ids"), 400
+
+    try:
+        result = moderate_reviews(approve_ids, reject_ids)
+    except SQLAlchemyError:
+        db.session.rollback()
+        server.logger.exception("Review moderation failed")
+        return jsonify(error="Review moderation failed"), 500
+
+    return jsonify(result)
+
+
 @server.route("/blog")
 def get_blog():
     """
@@ -347,7 +631,10 @@ def get_blog():
     Loads published blogs from the database
     """
     ctx = common_context()
-    blogs = Blog.get_published()
+    blogs = Blog.get_published_cards()
+
+    # Lets the CDN purge this page when any one of these blogs changes
+    add_surrogate_keys(*(f"blog:{blog.slug}" for blog in blogs))
 
     return render_template(
         "blog.html",
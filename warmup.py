@@ -0,0 +1,91 @@
+# warmup.py
+import threading
+import time
+
+from sqlalchemy import text
+
+from models import db
+
+
+class WarmUp:
+    """
+    Gets a worker ready to serve traffic without cold-start costs.
+
+    run() opens the pool's connections, compiles every template (which
+    also fills the on-disk bytecode cache) and requests the main pages
+    once so the fragment/query caches are filled. /readyz reports the
+    worker as ready only after that has finished.
+    """
+
+    # Pages requested once to fill the page and query caches
+    PAGES = ("/", "/blog", "/tutoring", "/sitemap.xml")
+
+    # Seconds to wait before retrying a failed warm-up, doubling each time
+    RETRY_BACKOFF = 5
+    MAX_RETRY_BACKOFF = 60
+
+    def __init__(self, app):
+        self.app = app
+        self.ready = threading.Event()
+        self.error = None
+        self._started = False
+        self._retry_at = 0
+        self._backoff = self.RETRY_BACKOFF
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Runs the warm-up in a background thread. Returns straight away.
+
+        Only one run happens at a time and a successful run is never
+        repeated. After a failure (e.g. the database blipping during a
+        deploy) the next call retries once the backoff has passed.
+        """
+        with self._lock:
+            if self._started or time.monotonic() < self._retry_at:
+                return
+            self._started = True
+            self.error = None
+
+        threading.Thread(target=self.run, name="warm-up", daemon=True).start()
+
+    def run(self):
+        try:
+            with self.app.app_context():
+                self.open_pool_connections()
+            self.compile_templates()
+            self.prime_pages()
+        except Exception as exc:
+            # Stay not-ready, let /readyz report why and allow
+            # a later probe to try again after the backoff
+            self.app.logger.exception("Warm-up failed")
+            with self._lock:
+                self.error = repr(exc)
+                self._retry_at = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, self.MAX_RETRY_BACKOFF)
+                self._started = False
+        else:
+            self.ready.set()
+
+    def open_pool_connections(self):
+        # Checking out pool_size connections at once makes the pool open
+        # them all now, instead of during the first requests.
+        pool = db.engine.pool
+        size = pool.size() if hasattr(pool, "size") else 1
+
+        connections = [db.engine.connect() for _ in range(size)]
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+            connection.close()
+
+    def compile_templates(self):
+        env = self.app.jinja_env
+        for name in env.list_templates(extensions=["html", "xml"]):
+            env.get_template(name)
+
+    def prime_pages(self):
+        client = self.app.test_client()
+        for path in self.PAGES:
+            response = client.get(path)
+            if response.status_code >= 500:
+                raise RuntimeError(f"Warm-up request to {path} returned {response.status_code}")